@@ -6,9 +6,10 @@ from dh5 import DH5
 
 from ..logger import logger
 from ..utils.file_read import read_files
+from .dunder_guard import DunderGuard
 
 
-class NotebookAcquisitionData(DH5):
+class NotebookAcquisitionData(DunderGuard, DH5):
     """It's a DH5 that has information about the configs file and the cell.
 
     `configs` is a list of the paths to the files that saved by `save_config_files` function.
@@ -6,8 +6,10 @@ import numpy as np
 from dh5 import DH5
 from dh5.dh5_types import SyncNp
 
+from .dunder_guard import DunderGuard
 
-class AcquisitionLoop(DH5):
+
+class AcquisitionLoop(DunderGuard, DH5):
     """Comfort way to save a data on change inside a loop without thinking about shape.
 
     Examples:
@@ -159,40 +161,44 @@ class AcquisitionLoop(DH5):
         else:
             key_shape = shape
 
+        # Each self[key] goes through DH5 checks, so the current array is fetched only once.
         if key in self:
-            if self[key].shape == key_shape:
-                self[key][iteration] = value
+            array = self[key]
+            if array.shape == key_shape:
+                array[iteration] = value
+                # Only in-place changes have to be marked. Setting a key already does it.
+                self._last_update.add(key)
             else:
-                if len(key_shape) < len(self[key].shape):
+                if len(key_shape) < len(array.shape):
                     raise ValueError(
                         f"Object {key} hasn't the same shape as before. Now it's"
                         f" {key_shape[len(shape):]},"
-                        f" but before it was {self[key].shape[len(shape):]}."
+                        f" but before it was {array.shape[len(shape):]}."
                     )
-                if len(key_shape) > len(self[key].shape):
+                if len(key_shape) > len(array.shape):
                     raise ValueError(
                         f"Object {key} cannot be save as the shape is not compatible. "
-                        f"Before the shape was {self[key].shape}, but now it is {key_shape}."
+                        f"Before the shape was {array.shape}, but now it is {key_shape}."
                     )
 
-                self[key] = SyncNp(
+                array = SyncNp(
                     np.pad(
-                        self[key],
+                        array,
                         pad_width=tuple(
-                            (0, i - j) for i, j in zip(key_shape, self[key].shape)
+                            (0, i - j) for i, j in zip(key_shape, array.shape)
                         ),
                     )
                 )
-                self[key][iteration] = value
+                self[key] = array
+                array[iteration] = value
         else:
             if np.iscomplexobj(value):
-                self[key] = SyncNp(np.zeros(key_shape, dtype=np.complex128))
+                array = SyncNp(np.zeros(key_shape, dtype=np.complex128))
             else:
-                self[key] = SyncNp(np.zeros(key_shape))
-
-            self[key][iteration] = value
+                array = SyncNp(np.zeros(key_shape))
 
-        self._last_update.add(key)
+            self[key] = array
+            array[iteration] = value
 
     def iter(
         self,
@@ -2,15 +2,31 @@
 
 import json
 import os
-from typing import List, Literal, Optional, Protocol, Tuple, TypedDict, TypeVar, Union
+from contextlib import contextmanager
+from typing import (
+    Iterable,
+    Iterator,
+    List,
+    Literal,
+    Optional,
+    Protocol,
+    Set,
+    Tuple,
+    TypedDict,
+    TypeVar,
+    Union,
+)
 
 from dh5 import DH5
+from dh5.errors import FileLockedError
 from dh5.path import Path
 
 from .. import utils
+from ..utils import h5py_utils
 from ..logger import logger
 from .analysis_loop import AnalysisLoop
 from .config_file import ConfigFile
+from .dunder_guard import DunderGuard
 
 _T = TypeVar("_T", bound="AnalysisData")
 
@@ -29,7 +45,7 @@ class PdfMetadataDict(TypedDict, total=False):
     Keywords: Union[str, dict]
 
 
-class AnalysisData(DH5):
+class AnalysisData(DunderGuard, DH5):
     """A subclass of DH5 that provides additional functionality for analyzing data.
 
     This class opens a provided file and locks all the data. It means that
@@ -73,6 +89,8 @@ class AnalysisData(DH5):
     _figure_saved = False
     _fig_index = 0
     _default_parse_config_str_max_length = 60
+    _in_batch = 0
+    _batch_save: Union[bool, Set[str]] = False
 
     def __init__(
         self,
@@ -96,8 +114,7 @@ class AnalysisData(DH5):
         """
         if filepath is None:
             raise ValueError("You must specify filepath")
-        filepath = str(filepath)
-        filepath = filepath if filepath.endswith(".h5") else filepath + ".h5"
+        filepath = utils.with_h5_extension(str(filepath))
 
         if not os.path.exists(filepath):
             raise ValueError(f"File '{filepath}' does not exist.")
@@ -121,14 +138,25 @@ class AnalysisData(DH5):
 
         self._reset_attrs()
 
-        for key, value in self.items():
-            if isinstance(value, dict) and value.get("__loop_shape__") is not None:
-                self._update({key: AnalysisLoop(value)})
-
         self._analysis_cell = cell
 
         self.save_analysis_cell()
 
+    def _update(self, __m: Optional[dict] = None, **kwds):
+        """Update only internal data. Dicts saved by `AcquisitionLoop` become `AnalysisLoop`.
+
+        It runs every time keys are loaded from the file, so with `open_on_init=False`
+        a loop is converted only when its key is accessed for the first time.
+        """
+        if __m is not None:
+            kwds.update(__m)
+
+        for key, value in kwds.items():
+            if isinstance(value, dict) and value.get("__loop_shape__") is not None:
+                kwds[key] = AnalysisLoop(value)
+
+        return super()._update(kwds)
+
     def _reset_attrs(self):
         self._fig_index = 0
         self._figure_saved = False
@@ -275,15 +303,15 @@ class AnalysisData(DH5):
 
         if not isinstance(config_files, tuple):
             config_files = tuple(config_files)
-        if hash(config_files) in self._parsed_configs:
-            return self._parsed_configs[hash(config_files)]
+        if config_files in self._parsed_configs:
+            return self._parsed_configs[config_files]
 
         config_data = sum(
             (self.parse_config_file(config_file) for config_file in config_files),
             ConfigFile(),
         )
 
-        self._parsed_configs[hash(config_files)] = config_data
+        self._parsed_configs[config_files] = config_data
 
         return config_data
 
@@ -428,9 +456,124 @@ class AnalysisData(DH5):
         # raise NotImplementedError(
         # "Not implemented for the moment. If you want to open an old figure. Use open_old_figs function")
 
+    def save(
+        self,
+        only_update: Union[bool, Iterable[str]] = True,
+        filepath: Optional[str] = None,
+        force: Optional[bool] = None,
+    ):
+        """Save the data to the file. Same arguments as `DH5.save`.
+
+        When only the updated keys are saved, the keys that already exist inside the file
+        with the same shape and dtype are overwritten in place. So editing an array or
+        a number does not recreate its dataset. Everything else is saved by `DH5.save`.
+        If no key is waiting to be saved, the file is not touched at all.
+        Inside a `batch` block the keys stay pending and are saved when the block exits.
+        """
+        if not isinstance(only_update, bool):
+            only_update = set(only_update)
+
+        if (
+            only_update is False
+            or filepath is not None
+            or force is True
+            or self._read_only is True
+            or not self._filepath
+        ):
+            return super().save(only_update=only_update, filepath=filepath, force=force)
+
+        if self._in_batch:
+            if only_update is True or self._batch_save is True:
+                self._batch_save = True
+            else:
+                self._batch_save = set(self._batch_save or ()).union(only_update)
+            return self
+
+        self._pre_save()
+        keys = (
+            set(self._last_update)
+            if only_update is True
+            else self._last_update.intersection(only_update)
+        )
+        if not keys:
+            # Nothing is pending (e.g. already saved by save_on_edit), so the file is not opened.
+            if not self._last_update:
+                self._last_data_saved = True
+            return self
+
+        try:
+            updated = h5py_utils.update_datasets_inplace(
+                self._filepath,
+                self._data,
+                keys=keys.difference(self._classes_should_be_saved_internally),
+                key_prefix=self._key_prefix,
+            )
+        except FileLockedError:
+            updated = set()
+
+        if updated:
+            self._file_modified_time = os.path.getmtime(self._filepath)
+            self._last_update.difference_update(updated)
+            if not self._last_update:
+                self._last_data_saved = True
+            if updated.issuperset(keys):
+                return self
+
+        return super().save(only_update=only_update, filepath=filepath, force=force)
+
+    @contextmanager
+    def batch(self: _T) -> Iterator[_T]:
+        """Postpone saving until the end of the block.
+
+        Inside this block saves are only collected: both the ones triggered by `save_on_edit`
+        and explicit `save` calls. When the block exits, everything that was due is saved
+        at once. With `save_on_edit=False` only the explicitly requested saves are run.
+
+        Examples:
+            >>> with data.batch():
+            ...     for i in range(10):
+            ...         data[f"x{i}"] = i
+        """
+        self._in_batch += 1
+        try:
+            yield self
+        finally:
+            self._in_batch -= 1
+            if not self._in_batch:
+                only_update, self._batch_save = self._batch_save, False
+                if only_update:
+                    self.save(only_update=only_update)
+
     def pull(self, force_pull: bool = False):
+        parsed_configs = self._parsed_configs
         self._reset_attrs()
-        return super().pull(force_pull)
+        super().pull(force_pull)
+        if parsed_configs:
+            self._parsed_configs = self._get_still_valid_configs(parsed_configs)
+        return self
+
+    def _get_still_valid_configs(self, parsed_configs: dict) -> dict:
+        """Keep only parsed configs whose source did not change inside the file.
+
+        Configs found by a prefix of their name and combinations of configs that
+        include such names are dropped, so they are parsed again on demand.
+        """
+        configs = self.get_raw("configs") or {}
+        valid = {
+            name: config
+            for name, config in parsed_configs.items()
+            if isinstance(name, str)
+            and config.content is not None
+            and configs.get(name) == config.content
+        }
+        valid.update(
+            {
+                names: config
+                for names, config in parsed_configs.items()
+                if isinstance(names, tuple) and all(name in valid for name in names)
+            }
+        )
+        return valid
 
     @property
     def figure_saved(self):
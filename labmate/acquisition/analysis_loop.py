@@ -6,8 +6,10 @@ from typing import Any, Iterable, List, Optional, Tuple, Union
 
 from dh5 import DH5
 
+from .dunder_guard import DunderGuard
 
-class AnalysisLoop(DH5):
+
+class AnalysisLoop(DunderGuard, DH5):
     """A class for reading a dictionary that was created by AcquisitionLoop.
 
     Args:
@@ -69,25 +71,28 @@ class AnalysisLoop(DH5):
         if self._loop_shape is None:
             raise ValueError("loop_shape should be set before iterating over it")
 
+        # The kind of each value does not depend on the index, so it's checked only once.
+        # Each item is (key, value, True if value should be indexed).
+        items: List[Tuple[str, Any, bool]] = []
+        for key, value in self._data.items():
+            if key[:1] == "_":
+                continue
+
+            # if not isinstance(value, Iterable) or isinstance(value, (str, bytes)):
+            if not hasattr(value, "__getitem__") or isinstance(
+                value, (str, bytes, int, float, complex)
+            ):
+                items.append((key, _unwrap_single(value), False))
+            elif len(value) == 1:
+                items.append((key, _unwrap_single(value[0]), False))
+            else:
+                items.append((key, value, True))
+
         for index in range(self._loop_shape[0]):
-            child_kwds = {}
-            for key, value in self._data.items():
-                if key[:1] == "_":
-                    continue
-
-                # if not isinstance(value, Iterable) or isinstance(value, (str, bytes)):
-                if not hasattr(value, "__getitem__") or isinstance(
-                    value, (str, bytes, int, float, complex)
-                ):
-                    child_kwds[key] = value
-                elif len(value) == 1:
-                    child_kwds[key] = value[0]
-                else:
-                    child_kwds[key] = value[index]
-
-                val = child_kwds[key]
-                if isinstance(val, (Iterable)) and len(val) == 1 and not isinstance(val[0], (Iterable)):  # type: ignore
-                    child_kwds[key] = val[0]  # type: ignore
+            child_kwds = {
+                key: _unwrap_single(value[index]) if indexed else value
+                for key, value, indexed in items
+            }
 
             if len(self._loop_shape) > 1:
                 yield AnalysisLoop(child_kwds, loop_shape=self._loop_shape[1:].copy())
@@ -155,3 +160,10 @@ class AnalysisLoop(DH5):
         if self._loop_shape is None:
             raise ValueError("loop_shape should be set before iterating over it")
         return self._loop_shape[0]
+
+
+def _unwrap_single(value):
+    """Return the element of a list that contains only one not iterable element."""
+    if isinstance(value, Iterable) and len(value) == 1 and not isinstance(value[0], Iterable):  # type: ignore
+        return value[0]  # type: ignore
+    return value
@@ -0,0 +1,19 @@
+"""DunderGuard mixin for DH5 subclasses."""
+
+
+class DunderGuard:
+    """Mixin that keeps Python protocol names away from the data lookup of DH5.
+
+    `DH5.__getattr__` looks every missing attribute up in the data. IPython, numpy, copy
+    and pickle probe for names like `__array__` or `__setstate__`, so these names raise
+    AttributeError straight away. Keys spelled like dunders, e.g. `__loop_shape__`,
+    stay reachable with `data["__loop_shape__"]`.
+
+    Should be put before DH5 in the bases of the class.
+    """
+
+    def __getattr__(self, __name: str):
+        """Call if __getattribute__ does not work."""
+        if __name[:2] == "__" and __name[-2:] == "__":
+            raise AttributeError(__name)
+        return super().__getattr__(__name)  # type: ignore
@@ -292,9 +292,7 @@ class AcquisitionAnalysisManager(AcquisitionManager):
             - If default configuration files are provided, they are set in the loaded data.
         """
         filename = self._get_full_filename(filename)
-        if not os.path.exists(
-            filename if filename.endswith(".h5") else filename + ".h5"
-        ):
+        if not os.path.exists(utils.with_h5_extension(filename)):
             raise ValueError(f"File {filename} cannot be found")
 
         data = AnalysisData(
@@ -386,9 +384,7 @@ class AcquisitionAnalysisManager(AcquisitionManager):
                 display_warning("Old data analysis")
 
             filename = str(filepath or self._get_full_filename(filename))  # type: ignore
-            filename = (
-                (filename.rsplit(".h5", 1)[0]) if filename.endswith(".h5") else filename
-            )
+            filename = utils.without_h5_extension(filename)
 
         else:
             self._is_old_data = False
@@ -0,0 +1,68 @@
+"""Utils to update data inside an existing h5 file without rewriting it."""
+
+import os
+from typing import Iterable, Optional, Set
+
+import h5py
+import numpy as np
+
+# LockFile is internal to dh5. This is the only place that imports it and
+# the supported dh5 versions are pinned in setup.py.
+from dh5.dh5_class.h5py_utils import LockFile
+
+_INPLACE_TYPES = (np.ndarray, np.number, int, float, complex)
+
+
+def update_datasets_inplace(
+    filename: str,
+    data: dict,
+    keys: Optional[Iterable[str]] = None,
+    key_prefix: Optional[str] = None,
+) -> Set[str]:
+    """Overwrite existing datasets in place.
+
+    A key is updated only if the file already contains a dataset under this key with
+    the same shape and dtype as the new value. All other keys (new keys, changed shape
+    or dtype, not an array or a number) are left untouched and should be saved the usual way.
+
+    All target datasets are resolved first and then written one after another with
+    `write_direct`, which copies the contiguous buffer without h5py selection overhead.
+
+    Args:
+        filename (str): Full filepath to the file.
+        data (dict): Data to write.
+        keys (Iterable[str], optional): Keys of `data` to write, so the caller does not
+         have to build a sub-dict. Keys missing from `data` are skipped.
+         Defaults to all keys of `data`.
+        key_prefix (str, optional): Key prefix of the desired location inside h5 file.
+         If nested use `key1/key2`. Defaults to None, i.e. root of the file.
+
+    Returns:
+        Set[str]: Keys that were updated in place.
+
+    Raises:
+        FileLockedError: If the file is locked by another writer.
+    """
+    keys = data.keys() if keys is None else keys
+    if not keys or not os.path.exists(filename):
+        return set()
+
+    with LockFile(filename), h5py.File(filename, "r+") as file:
+        updated, datasets, arrays = [], [], []
+        for key in keys:
+            value = data.get(key)
+            if not isinstance(value, _INPLACE_TYPES):
+                continue
+            dataset = file.get(key if key_prefix is None else f"{key_prefix}/{key}")
+            if not isinstance(dataset, h5py.Dataset):
+                continue
+            value = np.asarray(value, order="C")
+            if dataset.shape != value.shape or dataset.dtype != value.dtype:
+                continue
+            updated.append(key)
+            datasets.append(dataset)
+            arrays.append(value)
+
+        for dataset, value in zip(datasets, arrays):
+            dataset.write_direct(value)
+    return set(updated)
@@ -27,3 +27,13 @@ def run_functions(
                 func()
         else:
             functions()
+
+
+def with_h5_extension(filepath: str, /) -> str:
+    """Return filepath that ends with '.h5'. Adds the extension only if it is missing."""
+    return filepath if filepath.endswith(".h5") else filepath + ".h5"
+
+
+def without_h5_extension(filepath: str, /) -> str:
+    """Return filepath without the '.h5' extension. Other suffixes are kept as is."""
+    return filepath[:-3] if filepath.endswith(".h5") else filepath
@@ -38,7 +38,8 @@ setuptools.setup(
     python_requires=">=3.8",
     install_requires=[
         "numpy",
-        "dh5",
+        "h5py",
+        "dh5>=0.8.1,<0.9",
     ],
     extras_require={
         "all": ["matplotlib", "pltsave"],
@@ -1,10 +1,20 @@
+import copy
 import os
 import shutil
 import unittest
+from unittest import mock
 
+import h5py
+import numpy as np
 from dh5 import DH5
-
-from labmate.acquisition import AcquisitionManager, AnalysisData
+from dh5.dh5_types import SyncNp
+
+from labmate.acquisition import (
+    AcquisitionLoop,
+    AcquisitionManager,
+    AnalysisData,
+    AnalysisLoop,
+)
 from labmate.acquisition.acquisition_manager import read_files
 
 TEST_DIR = os.path.dirname(__file__)
@@ -38,6 +48,111 @@ class AnalysisDataTest(unittest.TestCase):
         sd = DH5(self.ad.filepath)
         self.assertEqual(sd.get("z"), 3)
 
+    def test_open_lazily(self):
+        loop = AcquisitionLoop()
+        for i in loop(3):
+            loop.append(i=i)
+        self.aqm.aq["loop"] = loop
+
+        ad = AnalysisData(self.aqm.current_filepath, cell="none", open_on_init=False)
+        self.assertNotIn("x", ad.asdict())
+        self.assertNotIn("loop", ad.asdict())
+
+        self.assertIsInstance(ad["loop"], AnalysisLoop)
+        self.assertEqual(ad["x"][0], 1)
+
+    def test_save_inplace(self):
+        self.ad["z"] = np.arange(3)
+        with h5py.File(self.ad.filepath + ".h5", "r+") as file:
+            file["z"].attrs["marker"] = 1
+
+        self.ad["z"] = np.arange(3) * 2
+        with h5py.File(self.ad.filepath + ".h5", "r") as file:
+            self.assertEqual(file["z"].attrs.get("marker"), 1, "Dataset was recreated")
+            self.assertEqual(file["z"][()].tolist(), [0, 2, 4])
+
+        self.ad["z"] = np.arange(4)
+        sd = DH5(self.ad.filepath)
+        self.assertEqual(sd.get("z").tolist(), [0, 1, 2, 3])
+
+    def test_save_only_update_iterator(self):
+        self.ad["z"] = np.arange(3)
+        ad = AnalysisData(self.aqm.current_filepath, save_on_edit=False)
+        ad.unlock_data("z")
+        ad["z"] = np.arange(3) * 2
+        ad["w"] = 4
+        ad.save(key for key in ("z", "w"))
+
+        sd = DH5(self.ad.filepath)
+        self.assertEqual(sd.get("z").tolist(), [0, 2, 4])
+        self.assertEqual(sd.get("w"), 4)
+
+    def test_save_nothing_to_update(self):
+        self.ad["z"] = 3
+        with mock.patch("dh5.dh5_class.h5py_utils.save_dict") as save_dict:
+            self.ad.save()
+            self.ad.save_analysis_cell("new cell")
+            save_dict.assert_called_once()
+
+    def test_save_scalar(self):
+        self.ad["z"] = 3
+        self.assertIs(type(self.ad["z"]), int)
+        with h5py.File(self.ad.filepath + ".h5", "r") as file:
+            self.assertEqual(file["z"].shape, ())
+
+    def test_save_inplace_scalar(self):
+        self.ad["z"] = 3
+        with h5py.File(self.ad.filepath + ".h5", "r+") as file:
+            file["z"].attrs["marker"] = 1
+
+        self.ad["z"] = 5
+        with h5py.File(self.ad.filepath + ".h5", "r") as file:
+            self.assertEqual(file["z"].attrs.get("marker"), 1, "Dataset was recreated")
+            self.assertEqual(file["z"][()], 5)
+
+    def test_batch(self):
+        with self.ad.batch():
+            self.ad["z"] = 3
+            self.ad["w"] = 4
+            self.assertNotIn("z", DH5(self.ad.filepath))
+
+        sd = DH5(self.ad.filepath)
+        self.assertEqual(sd.get("z"), 3)
+        self.assertEqual(sd.get("w"), 4)
+
+    def test_batch_explicit_save(self):
+        ad = AnalysisData(self.aqm.current_filepath, save_on_edit=False)
+        with ad.batch():
+            ad["z"] = 5
+            ad["w"] = 6
+            ad.save(["z"])
+            self.assertNotIn("z", DH5(self.ad.filepath))
+
+        sd = DH5(self.ad.filepath)
+        self.assertEqual(sd.get("z"), 5)
+        self.assertNotIn("w", sd)
+
+        with ad.batch():
+            ad.save()
+        self.assertEqual(DH5(self.ad.filepath).get("w"), 6)
+
+    def test_batch_child_saves_on_edit(self):
+        with self.ad.batch():
+            self.ad["arr"] = SyncNp(np.zeros(3))
+        self.ad["arr"][1] = 7
+        self.assertEqual(DH5(self.ad.filepath).get("arr").tolist(), [0, 7, 0])
+
+    def test_protocol_attributes(self):
+        self.assertFalse(hasattr(self.ad, "__array__"))
+        self.assertEqual(self.ad.x[0], 1)
+
+        ad_copy = copy.copy(self.ad)
+        self.assertEqual(ad_copy["x"][0], 1)
+
+        for obj in (AcquisitionLoop(), AnalysisLoop(), self.aqm.aq):
+            self.assertFalse(hasattr(obj, "__array__"))
+            copy.copy(obj)
+
     def test_analysis_cell(self):
         sd = DH5(self.aqm.aq.filepath)
         analysis_cell = sd.get("analysis_cells", {}).get("default")
@@ -330,6 +445,48 @@ class AnalysisDataParceTest(unittest.TestCase):
         return super().tearDownClass()
 
 
+class AnalysisDataPullTest(unittest.TestCase):
+    """Test that parsed configs survive pull if they did not change."""
+
+    experiment_name = "abc"
+
+    def setUp(self):
+        self.aqm = AcquisitionManager(DATA_DIR)
+        self.aqm.set_config_file(
+            (
+                os.path.join(TEST_DIR, "data/config.txt"),
+                os.path.join(TEST_DIR, "data/imported_config.py"),
+            )
+        )
+        self.aqm.new_acquisition(self.experiment_name)
+        self.ad = AnalysisData(self.aqm.current_filepath, cell="none")
+
+    def test_parse_config_after_pull(self):
+        """Configs that did not change are not parsed again after pull."""
+        data = self.ad.parse_config(("config.txt", "imported_config.py"))
+        config = self.ad.parse_config_file("config.txt")
+        imported = self.ad.parse_config_file("imported_config.py")
+
+        sd = DH5(self.ad.filepath, "a", save_on_edit=True)
+        configs = sd.get_raw("configs")
+        sd["configs"] = {**configs, "imported_config.py": "param = 1"}
+
+        self.ad.pull(force_pull=True)
+        self.assertIs(self.ad.parse_config_file("config.txt"), config)
+        self.assertIsNot(self.ad.parse_config_file("imported_config.py"), imported)
+        self.assertEqual(self.ad.parse_config_file("imported_config.py")["param"], 1)
+        self.assertIsNot(
+            self.ad.parse_config(("config.txt", "imported_config.py")), data
+        )
+
+    @classmethod
+    def tearDownClass(cls):
+        """Remove tmp_test_data directory ones all test finished."""
+        if os.path.exists(DATA_DIR):
+            shutil.rmtree(DATA_DIR)
+        return super().tearDownClass()
+
+
 class SimpleSaveFig:
     """This is emulation of a Figure class.
     The only goal of this class is to save something with savefig method.
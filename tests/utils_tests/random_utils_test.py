@@ -0,0 +1,21 @@
+import unittest
+
+from labmate.utils.random_utils import with_h5_extension, without_h5_extension
+
+
+class H5ExtensionTest(unittest.TestCase):
+    """Test functions that add or remove '.h5' extension."""
+
+    def test_with_h5_extension(self):
+        self.assertEqual(with_h5_extension("data/file"), "data/file.h5")
+        self.assertEqual(with_h5_extension("data/file.h5"), "data/file.h5")
+
+    def test_without_h5_extension(self):
+        self.assertEqual(without_h5_extension("data/file.h5"), "data/file")
+        self.assertEqual(without_h5_extension("data/file"), "data/file")
+        self.assertEqual(without_h5_extension("data/file.5h"), "data/file.5h")
+        self.assertEqual(without_h5_extension("data/file_5.h5"), "data/file_5")
+
+
+if __name__ == "__main__":
+    unittest.main()